@@ -0,0 +1,351 @@
+"""
+Numba kernels for the Cultural Algorithm
+Compiled per-generation routine operating on the population assignment matrix
+"""
+
+import importlib
+import numba
+import numpy as np
+from numba import njit, prange
+
+
+def _pick_threading_layer():
+    """
+    Layer for the parallel kernels: OpenMP, else the workqueue
+    
+    The default TBB layer hangs the interpreter at exit once a parallel
+    kernel has run off the main thread (the GUI runs the CA on a worker
+    thread). OpenMP is thread-safe; the workqueue fallback must not be
+    entered by two threads at once.
+    """
+    try:
+        importlib.import_module('numba.np.ufunc.omppool')
+    except ImportError:
+        return 'workqueue'
+    return 'omp'
+
+
+# Must be set before the first parallel kernel runs; an explicit
+# NUMBA_THREADING_LAYER from the environment is left alone
+if numba.config.THREADING_LAYER == 'default':
+    numba.config.THREADING_LAYER = _pick_threading_layer()
+
+
+# Fitness is 1 / (1 + time_weight * total_time + cost_weight * total_cost);
+# (time_weight, cost_weight) per objective, with the normalizers of the
+# 'weighted' objective (time / 1000, cost / 10000) folded in
+OBJECTIVE_WEIGHTS = {
+    'cost': (0.0, 1.0),
+    'time': (1.0, 0.0),
+    'weighted': (0.4 / 1000.0, 0.6 / 10000.0),
+}
+
+TOURNAMENT_SIZE = 3
+
+# Largest genotype space (num_resources ** num_tasks) for which a dense
+# fitness memo table is kept across the whole run
+MEMO_MAX_STATES = 1 << 16
+
+# Column layout of the per-child uniform draws; the fixed columns are
+# followed by three blocks of num_tasks per-gene columns (normative
+# influence rolls, normative resource picks, situational position keys)
+U_CROSSOVER = 0
+U_INFLUENCE = 1
+U_SITUATIONAL = 2
+U_NUM_GENES = 3
+U_MUTATION = 4
+U_NUM_MUTATIONS = 5
+UNIFORM_COLUMNS = 6
+
+# Fewest rows evaluated with the parallel kernel; smaller batches (the
+# usual populations of a few dozen rows) don't amortize the thread launch
+PARALLEL_MIN_ROWS = 1024
+
+
+def draw_generation(rng, fitness, num_tasks, num_resources, elitism_count):
+    """
+    Draw every random number one generation needs in a few batched calls
+    
+    Tournament selection for the whole generation is resolved here as well:
+    one (num_children, TOURNAMENT_SIZE) matrix of candidates is drawn and
+    the fittest candidate of each row wins.
+    
+    Args:
+        rng: numpy.random.Generator
+        fitness: Fitness of each row of the current population
+        num_tasks: Number of tasks (genes per individual)
+        num_resources: Number of resources (gene alphabet size)
+        elitism_count: Number of elites copied without random operators
+    
+    Returns:
+        Tuple (parents, uniforms, crossover_points, mutation_tasks,
+        mutation_targets) to pass on to evolve_generation()
+    """
+    pop_size = fitness.shape[0]
+    num_children = max(0, pop_size - min(elitism_count, pop_size))
+    num_children += num_children % 2  # children are produced in pairs
+    max_mutations = max(1, num_tasks // 4)
+    
+    tournaments = rng.integers(0, pop_size, size=(num_children, TOURNAMENT_SIZE))
+    parents = tournaments[np.arange(num_children), fitness[tournaments].argmax(axis=1)]
+    uniforms = rng.random((num_children, UNIFORM_COLUMNS + 3 * num_tasks))
+    crossover_points = rng.integers(1, max(2, num_tasks), size=num_children // 2)
+    mutation_tasks = rng.integers(0, num_tasks, size=(num_children, max_mutations))
+    mutation_targets = rng.integers(0, num_resources, size=(num_children, max_mutations))
+    return parents, uniforms, crossover_points, mutation_tasks, mutation_targets
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _evaluate_row(assign_mat, i, time_table, cost_table, time_weight,
+                  cost_weight, fitness, total_times, total_costs):
+    """Evaluate row i of the assignment matrix in place"""
+    total_time = 0.0
+    total_cost = 0.0
+    for j in range(assign_mat.shape[1]):
+        resource_idx = assign_mat[i, j]
+        total_time += time_table[j, resource_idx]
+        total_cost += cost_table[j, resource_idx]
+    total_times[i] = total_time
+    total_costs[i] = total_cost
+    fitness[i] = 1.0 / (1.0 + time_weight * total_time + cost_weight * total_cost)
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def _evaluate_rows_parallel(assign_mat, rows, time_table, cost_table, time_weight,
+                            cost_weight, fitness, total_times, total_costs):
+    """evaluate_rows() with the rows spread across CPU cores"""
+    for k in prange(rows.shape[0]):
+        _evaluate_row(assign_mat, rows[k], time_table, cost_table, time_weight,
+                      cost_weight, fitness, total_times, total_costs)
+
+
+@njit(cache=True, nogil=True)
+def evaluate_rows(assign_mat, rows, time_table, cost_table, time_weight,
+                  cost_weight, fitness, total_times, total_costs):
+    """
+    Evaluate the given rows of the assignment matrix in place
+    
+    Rows are independent; batches of at least PARALLEL_MIN_ROWS are spread
+    across CPU cores with prange, smaller ones are evaluated serially.
+    time_table[j, r] / cost_table[j, r] hold the execution time / cost of
+    task j on resource r, so each gene costs two table loads.
+    Results are written into fitness, total_times and total_costs.
+    """
+    if rows.shape[0] >= PARALLEL_MIN_ROWS:
+        _evaluate_rows_parallel(assign_mat, rows, time_table, cost_table, time_weight,
+                                cost_weight, fitness, total_times, total_costs)
+        return
+    for k in range(rows.shape[0]):
+        _evaluate_row(assign_mat, rows[k], time_table, cost_table, time_weight,
+                      cost_weight, fitness, total_times, total_costs)
+
+
+@njit(cache=True, nogil=True)
+def evaluate_population(assign_mat, time_table, cost_table, time_weight, cost_weight):
+    """
+    Evaluate every row of the assignment matrix
+    
+    Returns:
+        Tuple (fitness, total_times, total_costs) of arrays with shape (pop_size,)
+    """
+    pop_size = assign_mat.shape[0]
+    fitness = np.empty(pop_size)
+    total_times = np.empty(pop_size)
+    total_costs = np.empty(pop_size)
+    evaluate_rows(assign_mat, np.arange(pop_size), time_table, cost_table,
+                  time_weight, cost_weight, fitness, total_times, total_costs)
+    return fitness, total_times, total_costs
+
+
+@njit(cache=True, nogil=True)
+def _influence(child, best_assign, preferred_resources, preferred_offsets,
+               influence_rate, uniforms):
+    """
+    Apply belief space influence to a child assignment in place
+    
+    Returns:
+        True if any gene actually changed
+    """
+    changed = False
+    if uniforms[U_INFLUENCE] > influence_rate:
+        return changed
+    
+    num_tasks = child.shape[0]
+    rolls = uniforms[UNIFORM_COLUMNS:UNIFORM_COLUMNS + num_tasks]
+    picks = uniforms[UNIFORM_COLUMNS + num_tasks:UNIFORM_COLUMNS + 2 * num_tasks]
+    keys = uniforms[UNIFORM_COLUMNS + 2 * num_tasks:UNIFORM_COLUMNS + 3 * num_tasks]
+    
+    # Situational Knowledge Influence: Copy some genes from best individual
+    if best_assign.shape[0] > 0 and uniforms[U_SITUATIONAL] < 0.2:
+        num_genes = int(uniforms[U_NUM_GENES] * max(1, num_tasks // 3)) + 1
+        positions = np.argsort(keys)[:num_genes]
+        for pos in positions:
+            if child[pos] != best_assign[pos]:
+                child[pos] = best_assign[pos]
+                changed = True
+    
+    # Normative Knowledge Influence: Prefer resources in normative ranges
+    for task_idx in range(num_tasks):
+        if rolls[task_idx] < 0.3:  # 30% chance to apply normative influence
+            start = preferred_offsets[task_idx]
+            count = preferred_offsets[task_idx + 1] - start
+            if count > 0:
+                resource_idx = preferred_resources[start + int(picks[task_idx] * count)]
+                if child[task_idx] != resource_idx:
+                    child[task_idx] = resource_idx
+                    changed = True
+    return changed
+
+
+@njit(cache=True, nogil=True)
+def _mutate(child, mutation_rate, uniforms, mutation_tasks, mutation_targets):
+    """
+    Mutate a child assignment in place
+    
+    Returns:
+        True if any gene actually changed
+    """
+    changed = False
+    if uniforms[U_MUTATION] > mutation_rate:
+        return changed
+    
+    num_mutations = int(uniforms[U_NUM_MUTATIONS] * mutation_tasks.shape[0]) + 1
+    for k in range(num_mutations):
+        if child[mutation_tasks[k]] != mutation_targets[k]:
+            child[mutation_tasks[k]] = mutation_targets[k]
+            changed = True
+    return changed
+
+
+@njit(cache=True, nogil=True)
+def evolve_generation(assign_mat, fitness, total_times, total_costs, memo,
+                      time_table, cost_table,
+                      best_assign, preferred_resources, preferred_offsets, elitism_count,
+                      mutation_rate, crossover_rate, influence_rate,
+                      time_weight, cost_weight, parents, uniforms, crossover_points,
+                      mutation_tasks, mutation_targets):
+    """
+    Produce and evaluate the next generation in one compiled pass
+    
+    Args:
+        assign_mat: Current population (pop_size, num_tasks), sorted by
+                    descending fitness so the first rows are the elites
+        fitness, total_times, total_costs: Evaluation of each row of
+                                           assign_mat
+        memo: Fitness memo table (num_states, 3) of (fitness, time, cost),
+              indexed by the base-num_resources encoding of an assignment
+              and NaN where unknown; an empty table disables memoization
+        time_table, cost_table: Per (task, resource) execution time and cost
+        best_assign: Situational knowledge (best assignment), or an empty
+                     array when the belief space has none yet
+        preferred_resources, preferred_offsets: Normative knowledge in CSR
+                    form; the preferred resources of task t are
+                    preferred_resources[preferred_offsets[t]:preferred_offsets[t + 1]]
+        elitism_count: Number of leading rows copied unchanged
+        mutation_rate, crossover_rate, influence_rate: Operator probabilities
+        time_weight, cost_weight: Fitness weights from OBJECTIVE_WEIGHTS
+        parents, uniforms, crossover_points, mutation_tasks,
+        mutation_targets: Random draws produced by draw_generation()
+    
+    Children that end up identical to a parent (no crossover and no gene
+    changed by influence or mutation) inherit the parent's evaluation, and
+    assignments already seen during the run are served from the memo; only
+    the remaining rows are simulated.
+    
+    Returns:
+        Tuple (new_assign_mat, fitness, total_times, total_costs)
+    """
+    pop_size, num_tasks = assign_mat.shape
+    
+    new_assign_mat = np.empty_like(assign_mat)
+    new_fitness = np.empty(pop_size)
+    new_times = np.empty(pop_size)
+    new_costs = np.empty(pop_size)
+    dirty = np.zeros(pop_size, dtype=np.bool_)
+    
+    # Elitism: keep best individuals (and their evaluation)
+    count = min(elitism_count, pop_size)
+    new_assign_mat[:count] = assign_mat[:count]
+    new_fitness[:count] = fitness[:count]
+    new_times[:count] = total_times[:count]
+    new_costs[:count] = total_costs[:count]
+    
+    child1 = np.empty(num_tasks, dtype=assign_mat.dtype)
+    child2 = np.empty(num_tasks, dtype=assign_mat.dtype)
+    
+    # Generate rest of population
+    pair = 0
+    while count < pop_size:
+        c1 = 2 * pair
+        c2 = c1 + 1
+        parent1 = parents[c1]
+        parent2 = parents[c2]
+        
+        # Single-point crossover
+        crossed = not (num_tasks < 2 or uniforms[c1, U_CROSSOVER] > crossover_rate)
+        if not crossed:
+            child1[:] = assign_mat[parent1]
+            child2[:] = assign_mat[parent2]
+        else:
+            point = crossover_points[pair]
+            child1[:point] = assign_mat[parent1, :point]
+            child1[point:] = assign_mat[parent2, point:]
+            child2[:point] = assign_mat[parent2, :point]
+            child2[point:] = assign_mat[parent1, point:]
+        
+        # Apply belief space influence BEFORE mutation
+        changed1 = _influence(child1, best_assign, preferred_resources, preferred_offsets,
+                              influence_rate, uniforms[c1])
+        changed2 = _influence(child2, best_assign, preferred_resources, preferred_offsets,
+                              influence_rate, uniforms[c2])
+        
+        changed1 |= _mutate(child1, mutation_rate, uniforms[c1], mutation_tasks[c1], mutation_targets[c1])
+        changed2 |= _mutate(child2, mutation_rate, uniforms[c2], mutation_tasks[c2], mutation_targets[c2])
+        
+        new_assign_mat[count] = child1
+        if crossed or changed1:
+            dirty[count] = True
+        else:
+            new_fitness[count] = fitness[parent1]
+            new_times[count] = total_times[parent1]
+            new_costs[count] = total_costs[parent1]
+        count += 1
+        if count < pop_size:
+            new_assign_mat[count] = child2
+            if crossed or changed2:
+                dirty[count] = True
+            else:
+                new_fitness[count] = fitness[parent2]
+                new_times[count] = total_times[parent2]
+                new_costs[count] = total_costs[parent2]
+            count += 1
+        pair += 1
+    
+    # Serve previously seen assignments from the memo table
+    use_memo = memo.shape[0] > 0
+    codes = np.zeros(pop_size, dtype=np.int64)
+    if use_memo:
+        num_resources = time_table.shape[1]
+        for i in range(pop_size):
+            if not dirty[i]:
+                continue
+            code = 0
+            for j in range(num_tasks - 1, -1, -1):
+                code = code * num_resources + new_assign_mat[i, j]
+            codes[i] = code
+            if not np.isnan(memo[code, 0]):
+                new_fitness[i] = memo[code, 0]
+                new_times[i] = memo[code, 1]
+                new_costs[i] = memo[code, 2]
+                dirty[i] = False
+    
+    rows = np.flatnonzero(dirty)
+    evaluate_rows(new_assign_mat, rows, time_table, cost_table,
+                  time_weight, cost_weight, new_fitness, new_times, new_costs)
+    
+    if use_memo:
+        for i in rows:
+            memo[codes[i], 0] = new_fitness[i]
+            memo[codes[i], 1] = new_times[i]
+            memo[codes[i], 2] = new_costs[i]
+    return new_assign_mat, new_fitness, new_times, new_costs
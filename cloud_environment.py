@@ -7,6 +7,8 @@ Defines Task and Resource classes and simulation function
 class Task:
     """Represents a computing task with a specific length/requirement"""
     
+    __slots__ = ('id', 'length')
+    
     def __init__(self, task_id, length):
         self.id = task_id
         self.length = length
@@ -15,6 +17,8 @@ class Task:
 class Resource:
     """Represents a cloud computing resource with speed and cost"""
     
+    __slots__ = ('id', 'speed', 'cost')
+    
     def __init__(self, resource_id, speed, cost):
         """
         Args:
@@ -43,11 +47,8 @@ def simulate(tasks, resources, assignment):
     total_time = 0
     total_cost = 0
     
-    # Create a mapping from task.id to task index for robustness
-    task_id_to_index = {task.id: idx for idx, task in enumerate(tasks)}
-    
-    for task in tasks:
-        task_index = task_id_to_index[task.id]
+    # assignment is positional: assignment[i] belongs to tasks[i]
+    for task_index, task in enumerate(tasks):
         resource = resources[assignment[task_index]]
         execution_time = task.length / resource.speed
         execution_cost = execution_time * resource.cost
@@ -61,6 +62,45 @@ def simulate(tasks, resources, assignment):
     }
 
 
+def simulate_array(lengths, speeds, costs, assignment):
+    """
+    Vectorized counterpart of simulate() operating on NumPy arrays
+    
+    Args:
+        lengths: Array of task lengths (lengths[i] = length of task i)
+        speeds: Array of resource speeds
+        costs: Array of resource costs per unit time
+        assignment: Integer array of resource indices, one per task
+    
+    Returns:
+        Tuple (total_time, total_cost)
+    """
+    times = lengths / speeds[assignment]
+    total_time = times.sum()
+    total_cost = (times * costs[assignment]).sum()
+    return float(total_time), float(total_cost)
+
+
+def simulate_population(lengths, speeds, costs, assignments):
+    """
+    Simulate a whole population of assignments at once
+    
+    Args:
+        lengths: Array of task lengths, shape (num_tasks,)
+        speeds: Array of resource speeds
+        costs: Array of resource costs per unit time
+        assignments: Integer matrix of shape (pop_size, num_tasks), one
+                     assignment per row
+    
+    Returns:
+        Tuple (total_times, total_costs) of arrays with shape (pop_size,)
+    """
+    times = lengths[None, :] / speeds[assignments]
+    total_times = times.sum(axis=1)
+    total_costs = (times * costs[assignments]).sum(axis=1)
+    return total_times, total_costs
+
+
 if __name__ == "__main__":
     # Example usage
     tasks = [
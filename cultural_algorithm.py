@@ -3,19 +3,62 @@ Cultural Algorithm (CA) for Cloud Resource Allocation
 Implements CA with Belief Space for optimal task-to-resource assignments
 """
 
-import random
-import copy
-from typing import List, Tuple, Dict, Optional
-from cloud_environment import Task, Resource, simulate
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+from cloud_environment import Task, Resource, simulate_array
+from ca_kernels import MEMO_MAX_STATES, OBJECTIVE_WEIGHTS, draw_generation, evaluate_population, evolve_generation
+
+
+def objective_fitness(objective: str, total_time, total_cost):
+    """
+    Convert simulated time/cost into a fitness value (higher is better)
+    
+    Works element-wise, so total_time/total_cost may be scalars or arrays.
+    
+    Args:
+        objective: 'cost', 'time', or 'weighted'
+        total_time: Total execution time(s)
+        total_cost: Total execution cost(s)
+    """
+    if objective not in OBJECTIVE_WEIGHTS:
+        raise ValueError(f"Unknown objective: {objective}")
+    time_weight, cost_weight = OBJECTIVE_WEIGHTS[objective]
+    return 1.0 / (1.0 + time_weight * total_time + cost_weight * total_cost)
+
+
+def build_lookup_tables(tasks: List[Task], resources: List[Resource]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute execution time and cost of every (task, resource) pair
+    
+    Returns:
+        Tuple (time_table, cost_table), both of shape (num_tasks, num_resources)
+    """
+    lengths = np.array([t.length for t in tasks], dtype=np.float64)
+    speeds = np.array([r.speed for r in resources], dtype=np.float64)
+    costs = np.array([r.cost for r in resources], dtype=np.float64)
+    
+    time_table = lengths[:, None] / speeds[None, :]
+    cost_table = time_table * costs[None, :]
+    return time_table, cost_table
+
+
+def assignment_dtype(num_resources: int) -> np.dtype:
+    """Smallest signed integer dtype able to hold every resource index"""
+    for dtype in (np.int8, np.int16):
+        if num_resources - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int32)
 
 
 class Individual:
     """Represents a single solution (chromosome) in the CA population space"""
     
-    def __init__(self, assignment: List[int], tasks: List[Task], resources: List[Resource]):
+    __slots__ = ('assignment', 'tasks', 'resources', 'fitness', 'fitness_score')
+    
+    def __init__(self, assignment: np.ndarray, tasks: List[Task], resources: List[Resource]):
         """
         Args:
-            assignment: List of resource indices, one per task
+            assignment: Array of resource indices, one per task
             tasks: List of Task objects
             resources: List of Resource objects
         """
@@ -28,26 +71,20 @@ class Individual:
     def evaluate_fitness(self, objective: str = 'cost'):
         """
         Evaluate fitness of this individual
+        
+        Standalone evaluation (the CA itself evaluates whole populations in
+        ca_kernels); the task/resource arrays are built from the objects.
         Args:
             objective: 'cost', 'time', or 'weighted'
         """
-        result = simulate(self.tasks, self.resources, self.assignment)
-        total_time = result['total_time']
-        total_cost = result['total_cost']
+        lengths = np.array([t.length for t in self.tasks], dtype=np.float64)
+        speeds = np.array([r.speed for r in self.resources], dtype=np.float64)
+        costs = np.array([r.cost for r in self.resources], dtype=np.float64)
+        total_time, total_cost = simulate_array(lengths, speeds, costs,
+                                                np.asarray(self.assignment))
         
         self.fitness_score = (total_time, total_cost)
-        
-        if objective == 'cost':
-            self.fitness = 1.0 / (1.0 + total_cost)
-        elif objective == 'time':
-            self.fitness = 1.0 / (1.0 + total_time)
-        elif objective == 'weighted':
-            normalized_time = total_time / 1000.0
-            normalized_cost = total_cost / 10000.0
-            self.fitness = 1.0 / (1.0 + 0.4 * normalized_time + 0.6 * normalized_cost)
-        else:
-            raise ValueError(f"Unknown objective: {objective}")
-        
+        self.fitness = objective_fitness(objective, total_time, total_cost)
         return self.fitness
     
     def __str__(self):
@@ -76,100 +113,73 @@ class BeliefSpace:
         self.num_tasks = num_tasks
         self.num_resources = num_resources
         
-        # Situational Knowledge: Best individual
-        self.best_individual: Optional[Individual] = None
+        # Situational Knowledge: Best assignment
+        self.best_assignment: Optional[np.ndarray] = None
         self.best_fitness = float('-inf')
         
-        # Normative Knowledge: Acceptable ranges for each task position
-        # For each task position, store which resources are commonly used
-        self.normative_ranges = [
-            {
-                'lower': 0,  # Minimum resource index
-                'upper': num_resources - 1,  # Maximum resource index
-                'preferred': list(range(num_resources))  # Preferred resources
-            }
-            for _ in range(num_tasks)
-        ]
+        # Normative Knowledge: Preferred resources for each task position
+        # normative_preferred[task, resource] is True when the resource is
+        # commonly used for that task; initially every resource is preferred
+        self.normative_preferred = np.ones((num_tasks, num_resources), dtype=np.bool_)
+        self._index_preferred()
         
         # Domain Knowledge: Statistics about population
         self.domain_stats = {
             'avg_fitness': 0.0,
             'fitness_variance': 0.0,
-            'resource_usage': [0] * num_resources  # Usage count per resource
+            'resource_usage': np.zeros(num_resources, dtype=np.int64)  # Usage count per resource
         }
     
-    def update(self, population: List[Individual], accepted: List[Individual]):
+    def _index_preferred(self):
+        """
+        Rebuild the CSR index of normative_preferred used for sampling
+        
+        The preferred resources of task t are
+        preferred_resources[preferred_offsets[t]:preferred_offsets[t + 1]].
+        """
+        self.preferred_resources = np.nonzero(self.normative_preferred)[1]
+        self.preferred_offsets = np.zeros(self.num_tasks + 1, dtype=np.int64)
+        np.cumsum(self.normative_preferred.sum(axis=1), out=self.preferred_offsets[1:])
+    
+    def update(self, assignments: np.ndarray, fitness: np.ndarray, num_accepted: int):
         """
         Update belief space based on accepted individuals
         
         Args:
-            population: Current population
-            accepted: Individuals accepted for belief space update
+            assignments: Population assignment matrix (pop_size, num_tasks),
+                         sorted by descending fitness
+            fitness: Fitness of each row of assignments
+            num_accepted: Number of top rows accepted for belief space update
         """
-        if not accepted:
+        if num_accepted <= 0:
             return
         
+        accepted = assignments[:num_accepted]
+        
         # Update Situational Knowledge (best individual)
-        for individual in accepted:
-            if individual.fitness > self.best_fitness:
-                self.best_fitness = individual.fitness
-                self.best_individual = copy.deepcopy(individual)
+        best_idx = int(np.argmax(fitness[:num_accepted]))
+        if fitness[best_idx] > self.best_fitness:
+            self.best_fitness = float(fitness[best_idx])
+            self.best_assignment = assignments[best_idx].copy()
         
         # Update Normative Knowledge
-        # Analyze which resources are commonly used for each task position
-        for task_idx in range(self.num_tasks):
-            resource_counts = [0] * self.num_resources
-            for individual in accepted:
-                resource_idx = individual.assignment[task_idx]
-                resource_counts[resource_idx] += 1
-            
-            # Update preferred resources (most commonly used)
-            max_count = max(resource_counts)
-            if max_count > 0:
-                self.normative_ranges[task_idx]['preferred'] = [
-                    i for i, count in enumerate(resource_counts) 
-                    if count >= max_count * 0.5  # Resources used at least 50% as much as most common
-                ]
-            else:
-                self.normative_ranges[task_idx]['preferred'] = list(range(self.num_resources))
+        # Count how often each resource is used for each task position
+        resource_counts = np.zeros((self.num_tasks, self.num_resources), dtype=np.int32)
+        np.add.at(resource_counts, (np.arange(self.num_tasks)[None, :], accepted), 1)
+        
+        # Preferred resources: used at least 50% as much as the most common one
+        max_counts = resource_counts.max(axis=1, keepdims=True)
+        self.normative_preferred = resource_counts >= max_counts * 0.5
+        self._index_preferred()
         
         # Update Domain Knowledge
-        if population:
-            fitnesses = [ind.fitness for ind in population]
-            self.domain_stats['avg_fitness'] = sum(fitnesses) / len(fitnesses)
-            variance = sum((f - self.domain_stats['avg_fitness'])**2 for f in fitnesses) / len(fitnesses)
-            self.domain_stats['fitness_variance'] = variance
+        if len(fitness):
+            self.domain_stats['avg_fitness'] = float(fitness.mean())
+            self.domain_stats['fitness_variance'] = float(fitness.var())
             
             # Update resource usage statistics
-            self.domain_stats['resource_usage'] = [0] * self.num_resources
-            for individual in population:
-                for resource_idx in individual.assignment:
-                    self.domain_stats['resource_usage'][resource_idx] += 1
-    
-    def influence(self, individual: Individual, influence_rate: float = 0.3):
-        """
-        Influence individual based on belief space knowledge
-        
-        Args:
-            individual: Individual to be influenced
-            influence_rate: Probability of applying influence (0.0 to 1.0)
-        """
-        if random.random() > influence_rate:
-            return
-        
-        # Situational Knowledge Influence: Copy some genes from best individual
-        if self.best_individual is not None and random.random() < 0.2:
-            num_genes = random.randint(1, max(1, len(individual.assignment) // 3))
-            positions = random.sample(range(len(individual.assignment)), num_genes)
-            for pos in positions:
-                individual.assignment[pos] = self.best_individual.assignment[pos]
-        
-        # Normative Knowledge Influence: Prefer resources in normative ranges
-        for task_idx in range(len(individual.assignment)):
-            if random.random() < 0.3:  # 30% chance to apply normative influence
-                preferred = self.normative_ranges[task_idx]['preferred']
-                if preferred:
-                    individual.assignment[task_idx] = random.choice(preferred)
+            self.domain_stats['resource_usage'] = np.bincount(
+                assignments.ravel(), minlength=self.num_resources)
 
 
 class CulturalAlgorithm:
@@ -189,7 +199,9 @@ class CulturalAlgorithm:
                  objective: str = 'cost',
                  max_generations: int = 100,
                  acceptance_rate: float = 0.2,
-                 influence_rate: float = 0.3):
+                 influence_rate: float = 0.3,
+                 lookup_tables: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                 seed: Optional[int] = None):
         """
         Initialize Cultural Algorithm
         
@@ -204,7 +216,15 @@ class CulturalAlgorithm:
             max_generations: Maximum number of generations
             acceptance_rate: Fraction of population accepted for belief space update
             influence_rate: Probability of belief space influencing individuals
+            lookup_tables: Optional (time_table, cost_table) already built by
+                           build_lookup_tables(), e.g. shared between processes
+            seed: Seed (int or numpy SeedSequence) for this instance's random
+                  generator, None for fresh OS entropy; instances never share
+                  random state
         """
+        if objective not in OBJECTIVE_WEIGHTS:
+            raise ValueError(f"Unknown objective: {objective}")
+        
         self.tasks = tasks
         self.resources = resources
         self.population_size = population_size
@@ -212,116 +232,135 @@ class CulturalAlgorithm:
         self.crossover_rate = crossover_rate
         self.elitism_count = elitism_count
         self.objective = objective
+        self._time_weight, self._cost_weight = OBJECTIVE_WEIGHTS[objective]
         self.max_generations = max_generations
         self.acceptance_rate = acceptance_rate
         self.influence_rate = influence_rate
         
-        # Population Space
-        self.population: List[Individual] = []
+        # Execution time/cost of every (task, resource) pair never change
+        # during a run, so fitness evaluation only needs table lookups
+        if lookup_tables is None:
+            lookup_tables = build_lookup_tables(tasks, resources)
+        self._time_table, self._cost_table = lookup_tables
+        
+        # Population Space: one assignment per row, with per-row fitness
+        num_tasks = len(tasks)
+        # Genes are stored in the narrowest integer type that fits the
+        # resource alphabet (int8 for up to 128 resources)
+        self._gene_dtype = assignment_dtype(len(resources))
+        self._assign_mat = np.empty((0, num_tasks), dtype=self._gene_dtype)
+        self._fitness = np.empty(0, dtype=np.float64)
+        self._total_times = np.empty(0, dtype=np.float64)
+        self._total_costs = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+        
+        # Fitness memo keyed by assignment; only kept for small genotype spaces
+        num_states = len(resources) ** num_tasks
+        memo_rows = num_states if num_states <= MEMO_MAX_STATES else 0
+        self._fitness_memo = np.full((memo_rows, 3), np.nan)
         self.generation = 0
         self.best_fitness_history: List[float] = []
         self.avg_fitness_history: List[float] = []
-        self.best_individual: Individual = None
+        
+        # Best solution found so far, kept as plain arrays/scalars
+        self._best_assignment: Optional[np.ndarray] = None
+        self._best_fitness = float('-inf')
+        self._best_time = 0.0
+        self._best_cost = 0.0
         
         # Belief Space
         self.belief_space = BeliefSpace(len(tasks), len(resources))
     
-    def initialize_population(self):
-        """Create initial random population"""
-        self.population = []
-        for _ in range(self.population_size):
-            assignment = [random.randint(0, len(self.resources) - 1) 
-                         for _ in range(len(self.tasks))]
-            individual = Individual(assignment, self.tasks, self.resources)
-            individual.evaluate_fitness(self.objective)
-            self.population.append(individual)
-        
-        self.population.sort(key=lambda x: x.fitness, reverse=True)
-        self.best_individual = copy.deepcopy(self.population[0])
-        
-        # Initialize belief space
-        self.belief_space.update(self.population, self.population[:int(self.population_size * self.acceptance_rate)])
+    def _evaluate_population(self):
+        """Evaluate fitness of every row of the assignment matrix at once"""
+        self._fitness, self._total_times, self._total_costs = evaluate_population(
+            self._assign_mat, self._time_table, self._cost_table,
+            self._time_weight, self._cost_weight)
     
-    def selection(self) -> Tuple[Individual, Individual]:
-        """Tournament selection - select two parents"""
-        tournament_size = 3
-        tournament1 = random.sample(self.population, min(tournament_size, len(self.population)))
-        tournament2 = random.sample(self.population, min(tournament_size, len(self.population)))
-        
-        parent1 = max(tournament1, key=lambda x: x.fitness)
-        parent2 = max(tournament2, key=lambda x: x.fitness)
+    def _sort_population(self):
+        """
+        Move the top rows to the front of the population, best first
         
-        return parent1, parent2
+        Only the elites and the individuals accepted into the belief space
+        need to be ordered, so they are picked with an O(N) argpartition and
+        just that slice is sorted; the remaining rows keep arbitrary order.
+        """
+        num_accepted = max(1, int(self.population_size * self.acceptance_rate))
+        num_top = min(max(self.elitism_count, num_accepted), len(self._fitness))
+        if num_top < len(self._fitness):
+            top = np.argpartition(-self._fitness, num_top - 1)[:num_top]
+        else:
+            top = np.arange(num_top)
+        top = top[np.argsort(-self._fitness[top], kind='stable')]
+        rest = np.ones(len(self._fitness), dtype=np.bool_)
+        rest[top] = False
+        order = np.concatenate((top, np.flatnonzero(rest)))
+        self._assign_mat = self._assign_mat[order]
+        self._fitness = self._fitness[order]
+        self._total_times = self._total_times[order]
+        self._total_costs = self._total_costs[order]
     
-    def crossover(self, parent1: Individual, parent2: Individual) -> Tuple[Individual, Individual]:
-        """Single-point crossover"""
-        if random.random() > self.crossover_rate:
-            return copy.deepcopy(parent1), copy.deepcopy(parent2)
-        
-        point = random.randint(1, len(self.tasks) - 1)
-        
-        child1_assignment = parent1.assignment[:point] + parent2.assignment[point:]
-        child2_assignment = parent2.assignment[:point] + parent1.assignment[point:]
-        
-        child1 = Individual(child1_assignment, self.tasks, self.resources)
-        child2 = Individual(child2_assignment, self.tasks, self.resources)
-        
-        return child1, child2
+    def _track_best(self):
+        """Record population row 0 as the best solution if it improves on it"""
+        if self._fitness[0] > self._best_fitness:
+            self._best_assignment = self._assign_mat[0].copy()
+            self._best_fitness = float(self._fitness[0])
+            self._best_time = float(self._total_times[0])
+            self._best_cost = float(self._total_costs[0])
     
-    def mutate(self, individual: Individual):
-        """Mutate an individual"""
-        if random.random() > self.mutation_rate:
-            return
+    @property
+    def best_individual(self) -> Optional[Individual]:
+        """Best solution found so far, built as an Individual on access"""
+        if self._best_assignment is None:
+            return None
+        individual = Individual(self._best_assignment.copy(), self.tasks, self.resources)
+        individual.fitness = self._best_fitness
+        individual.fitness_score = (self._best_time, self._best_cost)
+        return individual
+    
+    def initialize_population(self):
+        """Create initial random population"""
+        self._assign_mat = self._rng.integers(
+            0, len(self.resources), size=(self.population_size, len(self.tasks)),
+            dtype=self._gene_dtype)
+        self._evaluate_population()
+        self._sort_population()
+        self._track_best()
         
-        num_mutations = random.randint(1, max(1, len(self.tasks) // 4))
-        for _ in range(num_mutations):
-            task_idx = random.randint(0, len(self.tasks) - 1)
-            individual.assignment[task_idx] = random.randint(0, len(self.resources) - 1)
+        # Initialize belief space
+        self.belief_space.update(self._assign_mat, self._fitness,
+                                 int(self.population_size * self.acceptance_rate))
     
     def evolve(self):
         """Run one generation of evolution"""
-        new_population = []
-        
-        # Elitism: keep best individuals
-        for i in range(self.elitism_count):
-            new_population.append(copy.deepcopy(self.population[i]))
-        
-        # Generate rest of population
-        while len(new_population) < self.population_size:
-            parent1, parent2 = self.selection()
-            child1, child2 = self.crossover(parent1, parent2)
-            
-            # Apply belief space influence BEFORE mutation
-            self.belief_space.influence(child1, self.influence_rate)
-            self.belief_space.influence(child2, self.influence_rate)
-            
-            self.mutate(child1)
-            self.mutate(child2)
-            
-            child1.evaluate_fitness(self.objective)
-            child2.evaluate_fitness(self.objective)
-            
-            new_population.append(child1)
-            if len(new_population) < self.population_size:
-                new_population.append(child2)
-        
-        # Update population
-        self.population = new_population[:self.population_size]
-        self.population.sort(key=lambda x: x.fitness, reverse=True)
+        best_assign = self.belief_space.best_assignment
+        if best_assign is None:
+            best_assign = np.empty(0, dtype=self._assign_mat.dtype)
+        
+        # Draw the generation's random numbers up front, then run selection,
+        # crossover, belief space influence, mutation and evaluation inside
+        # the compiled kernel
+        draws = draw_generation(self._rng, self._fitness, len(self.tasks),
+                                len(self.resources), self.elitism_count)
+        self._assign_mat, self._fitness, self._total_times, self._total_costs = evolve_generation(
+            self._assign_mat, self._fitness, self._total_times, self._total_costs,
+            self._fitness_memo, self._time_table, self._cost_table,
+            best_assign, self.belief_space.preferred_resources,
+            self.belief_space.preferred_offsets,
+            self.elitism_count, self.mutation_rate, self.crossover_rate,
+            self.influence_rate, self._time_weight, self._cost_weight, *draws)
+        self._sort_population()
         
         # Update best individual
-        if self.population[0].fitness > self.best_individual.fitness:
-            self.best_individual = copy.deepcopy(self.population[0])
+        self._track_best()
         
         # Update belief space with accepted individuals
         num_accepted = max(1, int(self.population_size * self.acceptance_rate))
-        accepted = self.population[:num_accepted]
-        self.belief_space.update(self.population, accepted)
+        self.belief_space.update(self._assign_mat, self._fitness, num_accepted)
         
         # Record statistics
-        self.best_fitness_history.append(self.best_individual.fitness)
-        avg_fitness = sum(ind.fitness for ind in self.population) / len(self.population)
-        self.avg_fitness_history.append(avg_fitness)
+        self.best_fitness_history.append(self._best_fitness)
+        self.avg_fitness_history.append(self.belief_space.domain_stats['avg_fitness'])
         
         self.generation += 1
     
@@ -330,42 +369,38 @@ class CulturalAlgorithm:
         self.initialize_population()
         
         if verbose:
-            print(f"Initial Best Fitness: {self.best_individual.fitness:.6f}")
-            result = simulate(self.tasks, self.resources, self.best_individual.assignment)
-            print(f"Initial Best - Time: {result['total_time']:.2f}, Cost: {result['total_cost']:.2f}")
+            print(f"Initial Best Fitness: {self._best_fitness:.6f}")
+            print(f"Initial Best - Time: {self._best_time:.2f}, Cost: {self._best_cost:.2f}")
         
         for generation in range(self.max_generations):
             self.evolve()
             
             if verbose and (generation + 1) % 10 == 0:
-                result = simulate(self.tasks, self.resources, self.best_individual.assignment)
                 print(f"Generation {generation + 1}/{self.max_generations} - "
-                      f"Best Fitness: {self.best_individual.fitness:.6f}, "
-                      f"Time: {result['total_time']:.2f}, Cost: {result['total_cost']:.2f}")
+                      f"Best Fitness: {self._best_fitness:.6f}, "
+                      f"Time: {self._best_time:.2f}, Cost: {self._best_cost:.2f}")
         
         if verbose:
-            print(f"\nFinal Best Fitness: {self.best_individual.fitness:.6f}")
-            result = simulate(self.tasks, self.resources, self.best_individual.assignment)
-            print(f"Final Best - Time: {result['total_time']:.2f}, Cost: {result['total_cost']:.2f}")
-            print(f"Final Assignment: {self.best_individual.assignment}")
+            print(f"\nFinal Best Fitness: {self._best_fitness:.6f}")
+            print(f"Final Best - Time: {self._best_time:.2f}, Cost: {self._best_cost:.2f}")
+            print(f"Final Assignment: {self._best_assignment.tolist()}")
         
         return self.best_individual
     
     def get_statistics(self) -> Dict:
         """Get statistics about the CA run"""
-        result = simulate(self.tasks, self.resources, self.best_individual.assignment)
         return {
-            'best_fitness': self.best_individual.fitness,
-            'best_time': result['total_time'],
-            'best_cost': result['total_cost'],
-            'best_assignment': self.best_individual.assignment,
+            'best_fitness': self._best_fitness,
+            'best_time': self._best_time,
+            'best_cost': self._best_cost,
+            'best_assignment': self._best_assignment.tolist(),
             'generations': self.generation,
             'fitness_history': self.best_fitness_history,
             'avg_fitness_history': self.avg_fitness_history,
             'belief_space_stats': {
                 'best_fitness': self.belief_space.best_fitness,
                 'avg_fitness': self.belief_space.domain_stats['avg_fitness'],
-                'resource_usage': self.belief_space.domain_stats['resource_usage']
+                'resource_usage': self.belief_space.domain_stats['resource_usage'].tolist()
             }
         }
 
@@ -5,13 +5,33 @@ Provides user interface for input, algorithm selection, and result visualization
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
-import json
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import queue
 import threading
+from concurrent.futures import Future
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from cloud_environment import Task, Resource, simulate
 from cultural_algorithm import CulturalAlgorithm
+from simulation_generator import (generate_random_tasks, generate_random_resources, read_json, write_json,
+                                  tasks_to_json, resources_to_json, tasks_from_json, resources_from_json)
+
+
+# Interval (ms) at which queued log messages are flushed to the log widget,
+# and the most messages flushed per tick
+LOG_POLL_MS = 50
+LOG_BATCH_SIZE = 500
+
+_FMT_2F = "{:.2f}".format
+
+# Rows dropped from a treeview are detached and kept for reuse, up to this
+# many beyond the rows shown; past that the detached rows are deleted
+MAX_DETACHED_ROWS = 256
+
+
+def _format_resource_row(values):
+    """Displayed (id, speed, cost) of a resource row"""
+    resource_id, speed, cost = values
+    return (resource_id, _FMT_2F(speed), _FMT_2F(cost))
 
 
 class CloudAllocationGUI:
@@ -26,7 +46,22 @@ class CloudAllocationGUI:
         self.resources = []
         self.results = {}
         
+        # Set where tasks/resources/results change; the log poll refreshes
+        # the views every tick and skips the ones whose data is unchanged
+        self._tasks_dirty = False
+        self._resources_dirty = False
+        self._results_dirty = False
+        
+        # Treeview rows currently shown: row key -> (item iid, values)
+        self._task_iids = {}
+        self._resource_iids = {}
+        
+        # Log messages from any thread; drained on the Tk main thread, which
+        # also receives the futures of finished algorithm runs this way
+        self._log_q = queue.Queue()
+        
         self.setup_ui()
+        self.root.after(LOG_POLL_MS, self._drain_log_queue)
     
     def setup_ui(self):
         """Setup the user interface"""
@@ -141,7 +176,8 @@ class CloudAllocationGUI:
                    textvariable=self.crossover_var, width=10).grid(row=3, column=1, pady=2)
         
         # Execute button
-        ttk.Button(config_frame, text="Run Algorithm", command=self.run_algorithm).pack(pady=20)
+        self._run_btn = ttk.Button(config_frame, text="Run Algorithm", command=self.run_algorithm)
+        self._run_btn.pack(pady=20)
         
         # Right panel: Output log
         output_frame = ttk.LabelFrame(self.algorithm_frame, text="Execution Log", padding=10)
@@ -158,65 +194,116 @@ class CloudAllocationGUI:
         results_display_frame = ttk.LabelFrame(self.results_frame, text="Results Summary", padding=10)
         results_display_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.results_text = scrolledtext.ScrolledText(results_display_frame, height=15)
+        # Read-only; only enabled while update_results_display rewrites it
+        self.results_text = scrolledtext.ScrolledText(results_display_frame, height=15, state=tk.DISABLED)
         self.results_text.pack(fill=tk.BOTH, expand=True)
         
         # Visualization frame
         viz_frame = ttk.LabelFrame(self.results_frame, text="Visualization", padding=10)
         viz_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.viz_canvas = None
+        # Figure and canvas are built once and redrawn in place on updates
         self.viz_frame = viz_frame
+        # Constrained layout keeps the axes fitted on every draw, so updates
+        # need no tight_layout() pass of their own
+        self.fig = Figure(figsize=(12, 5), constrained_layout=True)
+        self.ax1, self.ax2 = self.fig.subplots(1, 2)
+        self.viz_canvas = FigureCanvasTkAgg(self.fig, self.viz_frame)
+        self.viz_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Bar artists of the plotted algorithms, reused while that set is unchanged
+        self._viz_algorithms = None
+        self._time_bars = None
+        self._cost_bars = None
     
     def generate_tasks(self):
         """Generate random tasks"""
-        import random
         num = self.num_tasks_var.get()
-        self.tasks = [Task(i, random.randint(50, 500)) for i in range(num)]
-        self.update_tasks_display()
+        self.tasks = generate_random_tasks(num)
+        self._tasks_dirty = True
         self.log(f"Generated {num} random tasks")
     
     def generate_resources(self):
         """Generate random resources"""
-        import random
         num = self.num_resources_var.get()
-        self.resources = [
-            Resource(i, random.uniform(5, 30), random.uniform(3, 15)) 
-            for i in range(num)
-        ]
-        self.update_resources_display()
+        self.resources = generate_random_resources(num)
+        self._resources_dirty = True
         self.log(f"Generated {num} random resources")
     
+    @staticmethod
+    def _sync_tree(tree, iids, rows, format_values=None):
+        """
+        Bring a treeview in line with rows, touching only what changed
+        
+        Args:
+            tree: Treeview to update
+            iids: Rows known to the tree (shown or detached), mapping
+                  row key -> (item iid, values); updated in place
+            rows: List of (id, values) in display order
+            format_values: Optional function turning values into the displayed
+                           tuple; only called for new or changed rows
+        """
+        # Key rows by (id, occurrence) so duplicate ids still get their own row
+        keyed_rows = []
+        occurrences = {}
+        for row_id, values in rows:
+            occurrence = occurrences.get(row_id, 0)
+            occurrences[row_id] = occurrence + 1
+            keyed_rows.append(((row_id, occurrence), values))
+        
+        order = []
+        for key, values in keyed_rows:
+            if key in iids:
+                iid, shown = iids[key]
+                if shown != values:
+                    tree.item(iid, values=format_values(values) if format_values else values)
+                    iids[key] = (iid, values)
+            else:
+                iid = tree.insert("", tk.END, values=format_values(values) if format_values else values)
+                iids[key] = (iid, values)
+            order.append(iid)
+        
+        # Reorders and reattaches in one call; rows left out are detached,
+        # not deleted, so they can come back without a new insert
+        if tree.get_children() != tuple(order):
+            tree.set_children("", *order)
+        
+        if len(iids) > len(order) + MAX_DETACHED_ROWS:
+            current_keys = {key for key, _ in keyed_rows}
+            stale = [key for key in iids if key not in current_keys]
+            tree.delete(*(iids.pop(key)[0] for key in stale))
+    
     def update_tasks_display(self):
         """Update tasks treeview"""
-        for item in self.tasks_tree.get_children():
-            self.tasks_tree.delete(item)
-        for task in self.tasks:
-            self.tasks_tree.insert("", tk.END, values=(task.id, task.length))
+        if not self._tasks_dirty:
+            return
+        self._tasks_dirty = False
+        rows = [(task.id, (task.id, task.length)) for task in self.tasks]
+        self._sync_tree(self.tasks_tree, self._task_iids, rows)
     
     def update_resources_display(self):
         """Update resources treeview"""
-        for item in self.resources_tree.get_children():
-            self.resources_tree.delete(item)
-        for resource in self.resources:
-            self.resources_tree.insert("", tk.END, values=(resource.id, f"{resource.speed:.2f}", f"{resource.cost:.2f}"))
+        if not self._resources_dirty:
+            return
+        self._resources_dirty = False
+        # Rows are compared on the raw numbers; only new or changed rows
+        # get their speed/cost formatted
+        rows = [(resource.id, (resource.id, resource.speed, resource.cost))
+                for resource in self.resources]
+        self._sync_tree(self.resources_tree, self._resource_iids, rows, _format_resource_row)
     
     def load_from_json(self):
         """Load tasks and resources from JSON files"""
         try:
             tasks_file = filedialog.askopenfilename(title="Select Tasks JSON", filetypes=[("JSON", "*.json")])
             if tasks_file:
-                with open(tasks_file, 'r') as f:
-                    tasks_data = json.load(f)
-                self.tasks = [Task(t['id'], t['length']) for t in tasks_data]
-                self.update_tasks_display()
+                self.tasks = tasks_from_json(read_json(tasks_file))
+                self._tasks_dirty = True
             
             resources_file = filedialog.askopenfilename(title="Select Resources JSON", filetypes=[("JSON", "*.json")])
             if resources_file:
-                with open(resources_file, 'r') as f:
-                    resources_data = json.load(f)
-                self.resources = [Resource(r['id'], r['speed'], r['cost']) for r in resources_data]
-                self.update_resources_display()
+                self.resources = resources_from_json(read_json(resources_file))
+                self._resources_dirty = True
             
             self.log("Loaded data from JSON files")
         except Exception as e:
@@ -227,15 +314,11 @@ class CloudAllocationGUI:
         try:
             tasks_file = filedialog.asksaveasfilename(title="Save Tasks JSON", defaultextension=".json", filetypes=[("JSON", "*.json")])
             if tasks_file:
-                tasks_data = [{"id": t.id, "length": t.length} for t in self.tasks]
-                with open(tasks_file, 'w') as f:
-                    json.dump(tasks_data, f, indent=2)
+                write_json(tasks_file, tasks_to_json(self.tasks))
             
             resources_file = filedialog.asksaveasfilename(title="Save Resources JSON", defaultextension=".json", filetypes=[("JSON", "*.json")])
             if resources_file:
-                resources_data = [{"id": r.id, "speed": r.speed, "cost": r.cost} for r in self.resources]
-                with open(resources_file, 'w') as f:
-                    json.dump(resources_data, f, indent=2)
+                write_json(resources_file, resources_to_json(self.resources))
             
             self.log("Saved data to JSON files")
         except Exception as e:
@@ -245,15 +328,38 @@ class CloudAllocationGUI:
         """Clear all tasks and resources"""
         self.tasks = []
         self.resources = []
-        self.update_tasks_display()
-        self.update_resources_display()
+        self._tasks_dirty = True
+        self._resources_dirty = True
         self.log("Cleared all data")
     
     def log(self, message):
-        """Add message to output log"""
-        self.output_text.insert(tk.END, message + "\n")
-        self.output_text.see(tk.END)
-        self.root.update()
+        """Add message to output log (safe to call from any thread)"""
+        self._log_q.put(message)
+    
+    def _drain_log_queue(self):
+        """Append queued log messages in one insert, refresh changed views, then reschedule"""
+        batch = []
+        try:
+            while len(batch) < LOG_BATCH_SIZE:
+                message = self._log_q.get_nowait()
+                if isinstance(message, Future):
+                    self._on_algorithm_done(message)
+                else:
+                    batch.append(message)
+        except queue.Empty:
+            pass
+        finally:
+            # Even if a result callback or a view refresh raises, keep what
+            # was drained and keep polling; otherwise logging and the Run
+            # button die with it
+            self.root.after(LOG_POLL_MS, self._drain_log_queue)
+            if batch:
+                self.output_text.insert(tk.END, "\n".join(batch) + "\n")
+                self.output_text.see(tk.END)
+            # Each returns at once unless its data changed since the last tick
+            self.update_tasks_display()
+            self.update_resources_display()
+            self.update_results_display()
     
     def run_algorithm(self):
         """Run selected algorithm"""
@@ -263,76 +369,102 @@ class CloudAllocationGUI:
         
         objective = self.objective_var.get()
         
-        self.log(f"\n{'='*60}")
-        self.log(f"Running Cultural Algorithm with objective: {objective}")
-        self.log(f"{'='*60}")
-        
-        # Run in separate thread to prevent GUI freezing
-        thread = threading.Thread(target=self._run_algorithm_thread, args=(objective,))
+        # One run at a time; re-enabled in _on_algorithm_done
+        self._run_btn.configure(state=tk.DISABLED)
+        
+        self.log(f"\n{'='*60}\n"
+                 f"Running Cultural Algorithm with objective: {objective}\n"
+                 f"{'='*60}")
+        
+        # Read the Tk variables here; the worker thread must not touch Tk
+        params = {
+            'population_size': self.pop_size_var.get(),
+            'max_generations': self.max_gen_var.get(),
+            'mutation_rate': self.mutation_var.get(),
+            'crossover_rate': self.crossover_var.get(),
+            'objective': objective
+        }
+        
+        # Run on a daemon thread to prevent GUI freezing (and so closing the
+        # window never waits for a run); the finished future is handed back
+        # to the Tk thread through the log queue
+        future = Future()
+        thread = threading.Thread(target=self._run_algorithm_worker,
+                                  args=(future, self._log_q, list(self.tasks),
+                                        list(self.resources), params))
         thread.daemon = True
         thread.start()
     
-    def _run_algorithm_thread(self, objective):
-        """Run algorithm in separate thread"""
+    @staticmethod
+    def _run_algorithm_worker(future, log_q, tasks, resources, params):
+        """Run the algorithm on the worker thread, then queue its finished future"""
         try:
-            ca = CulturalAlgorithm(
-                self.tasks, self.resources,
-                population_size=self.pop_size_var.get(),
-                max_generations=self.max_gen_var.get(),
-                mutation_rate=self.mutation_var.get(),
-                crossover_rate=self.crossover_var.get(),
-                objective=objective
-            )
-            best = ca.run(verbose=False)
-            stats = ca.get_statistics()
-            self.results['Cultural Algorithm'] = stats
-            self.log(f"\nCultural Algorithm Result:")
-            self.log(f"Assignment: {stats['best_assignment']}")
-            self.log(f"Total Time: {stats['best_time']:.2f}")
-            self.log(f"Total Cost: {stats['best_cost']:.2f}")
-            self.log(f"Best Fitness: {stats['best_fitness']:.6f}")
-            
-            self.update_results_display()
-            self.log("\nAlgorithm execution completed!")
-        
+            ca = CulturalAlgorithm(tasks, resources, **params)
+            ca.run(verbose=False)
+            future.set_result(ca.get_statistics())
+        except Exception as e:
+            future.set_exception(e)
+        log_q.put(future)
+    
+    def _on_algorithm_done(self, future):
+        """Report a finished algorithm run (called on the Tk main thread)"""
+        self._run_btn.configure(state=tk.NORMAL)
+        try:
+            stats = future.result()
         except Exception as e:
             self.log(f"\nError: {str(e)}")
             messagebox.showerror("Error", f"Algorithm execution failed: {str(e)}")
+            return
+        
+        self.results['Cultural Algorithm'] = stats
+        self._results_dirty = True
+        self.log("\n".join([
+            "\nCultural Algorithm Result:",
+            f"Assignment: {stats['best_assignment']}",
+            f"Total Time: {stats['best_time']:.2f}",
+            f"Total Cost: {stats['best_cost']:.2f}",
+            f"Best Fitness: {stats['best_fitness']:.6f}"
+        ]))
+        self.log("\nAlgorithm execution completed!")
     
     def update_results_display(self):
         """Update results display"""
-        self.results_text.delete(1.0, tk.END)
+        if not self._results_dirty:
+            return
+        self._results_dirty = False
         
         if not self.results:
-            self.results_text.insert(tk.END, "No results yet. Run an algorithm first.")
+            self._set_results_text("No results yet. Run an algorithm first.")
             return
         
-        self.results_text.insert(tk.END, "RESULTS SUMMARY\n")
-        self.results_text.insert(tk.END, "="*60 + "\n\n")
-        
+        # Build the whole summary first so the widget gets a single insert
+        lines = ["RESULTS SUMMARY", "="*60, ""]
         for algo_name, result in self.results.items():
-            self.results_text.insert(tk.END, f"{algo_name}:\n")
-            self.results_text.insert(tk.END, f"  Assignment: {result.get('assignment', result.get('best_assignment', 'N/A'))}\n")
-            self.results_text.insert(tk.END, f"  Total Time: {result.get('total_time', result.get('best_time', 'N/A')):.2f}\n")
-            self.results_text.insert(tk.END, f"  Total Cost: {result.get('total_cost', result.get('best_cost', 'N/A')):.2f}\n")
+            lines.append(f"{algo_name}:")
+            lines.append(f"  Assignment: {result.get('assignment', result.get('best_assignment', 'N/A'))}")
+            lines.append(f"  Total Time: {result.get('total_time', result.get('best_time', 'N/A')):.2f}")
+            lines.append(f"  Total Cost: {result.get('total_cost', result.get('best_cost', 'N/A')):.2f}")
             if 'nodes_explored' in result:
-                self.results_text.insert(tk.END, f"  Nodes Explored: {result['nodes_explored']}\n")
-            self.results_text.insert(tk.END, "\n")
+                lines.append(f"  Nodes Explored: {result['nodes_explored']}")
+            lines.append("")
+        self._set_results_text("\n".join(lines) + "\n")
         
         # Update visualization
         self.update_visualization()
     
+    def _set_results_text(self, text):
+        """Replace the contents of the read-only results text widget"""
+        self.results_text.configure(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, text)
+        self.results_text.configure(state=tk.DISABLED)
+    
     def update_visualization(self):
         """Update visualization"""
         if not self.results:
             return
         
-        # Clear previous visualization
-        if self.viz_canvas:
-            self.viz_canvas.get_tk_widget().destroy()
-        
-        # Create new figure
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        ax1, ax2 = self.ax1, self.ax2
         
         algorithms = list(self.results.keys())
         times = []
@@ -343,26 +475,37 @@ class CloudAllocationGUI:
             times.append(result.get('total_time', result.get('best_time', 0)))
             costs.append(result.get('total_cost', result.get('best_cost', 0)))
         
+        # Same algorithms as last time: only the bar heights change
+        if algorithms == self._viz_algorithms:
+            for bars, values in ((self._time_bars, times), (self._cost_bars, costs)):
+                for bar, value in zip(bars, values):
+                    bar.set_height(value)
+            for ax in (ax1, ax2):
+                ax.relim()
+                ax.autoscale_view()
+            self.viz_canvas.draw_idle()
+            return
+        
+        ax1.clear()
+        ax2.clear()
+        self._viz_algorithms = algorithms
+        
         # Time comparison
-        ax1.bar(algorithms, times, color='skyblue', edgecolor='navy', alpha=0.7)
+        self._time_bars = ax1.bar(algorithms, times, color='skyblue', edgecolor='navy', alpha=0.7)
         ax1.set_xlabel('Algorithm')
         ax1.set_ylabel('Total Time')
         ax1.set_title('Execution Time Comparison')
         ax1.tick_params(axis='x', rotation=45)
         
         # Cost comparison
-        ax2.bar(algorithms, costs, color='lightcoral', edgecolor='darkred', alpha=0.7)
+        self._cost_bars = ax2.bar(algorithms, costs, color='lightcoral', edgecolor='darkred', alpha=0.7)
         ax2.set_xlabel('Algorithm')
         ax2.set_ylabel('Total Cost')
         ax2.set_title('Execution Cost Comparison')
         ax2.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
-        
-        # Embed in tkinter
-        self.viz_canvas = FigureCanvasTkAgg(fig, self.viz_frame)
-        self.viz_canvas.draw()
-        self.viz_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Redraw the embedded canvas once Tk is idle
+        self.viz_canvas.draw_idle()
 
 
 def main():
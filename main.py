@@ -3,24 +3,44 @@ Main script for Cloud Resource Allocation using Cultural Algorithm
 Compares Cultural Algorithm with baseline strategies
 """
 
-import json
+import logging
+import os
 import time
-from cloud_environment import Task, Resource, simulate
-from simulation_generator import random_assignment, fastest_assignment, best_value_assignment
+from functools import lru_cache
+
+# Figures are only saved to files here, so use the non-interactive Agg
+# backend (the GUI embeds its own figure through FigureCanvasTkAgg)
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+from cloud_environment import simulate_population
+from simulation_generator import (random_assignment, fastest_assignment, best_value_assignment,
+                                  read_json, tasks_from_json, resources_from_json)
 from cultural_algorithm import CulturalAlgorithm
 from visualization import plot_comparison, plot_ga_convergence
 
 
+@lru_cache(maxsize=4)
+def _parse_json(path, mtime_ns, size):
+    """Parsed contents of a JSON file; (mtime_ns, size) invalidate the cache"""
+    return read_json(path)
+
+
+def _load_json(path):
+    """Parse a JSON file, reusing the previous parse while the file is unchanged"""
+    stat = os.stat(path)
+    return _parse_json(path, stat.st_mtime_ns, stat.st_size)
+
+
 def load_data_from_json():
     """Load tasks and resources from JSON files"""
     try:
-        with open('tasks.json', 'r') as f:
-            tasks_data = json.load(f)
-        with open('resources.json', 'r') as f:
-            resources_data = json.load(f)
+        tasks_data = _load_json('tasks.json')
+        resources_data = _load_json('resources.json')
         
-        tasks = [Task(t['id'], t['length']) for t in tasks_data]
-        resources = [Resource(r['id'], r['speed'], r['cost']) for r in resources_data]
+        tasks = tasks_from_json(tasks_data)
+        resources = resources_from_json(resources_data)
         
         return tasks, resources
     except FileNotFoundError:
@@ -40,18 +60,25 @@ def run_baseline_strategies(tasks, resources):
         "Best Value (Speed/Cost)": best_value_assignment(tasks, resources)
     }
     
+    # The strategies are independent, so simulate them all in one batch
+    lengths = np.array([t.length for t in tasks], dtype=np.float64)
+    speeds = np.array([r.speed for r in resources], dtype=np.float64)
+    costs = np.array([r.cost for r in resources], dtype=np.float64)
+    assignments = np.stack(list(strategies.values()))
+    total_times, total_costs = simulate_population(lengths, speeds, costs, assignments)
+    
     results = {}
-    for strategy_name, assignment in strategies.items():
-        result = simulate(tasks, resources, assignment)
+    for (strategy_name, assignment), total_time, total_cost in zip(
+            strategies.items(), total_times.tolist(), total_costs.tolist()):
         results[strategy_name] = {
             'assignment': assignment,
-            'time': result['total_time'],
-            'cost': result['total_cost']
+            'time': total_time,
+            'cost': total_cost
         }
         print(f"\n{strategy_name}:")
-        print(f"  Assignment: {assignment}")
-        print(f"  Total Time: {result['total_time']:.2f}")
-        print(f"  Total Cost: {result['total_cost']:.2f}")
+        print(f"  Assignment: {assignment.tolist()}")
+        print(f"  Total Time: {total_time:.2f}")
+        print(f"  Total Cost: {total_cost:.2f}")
     
     return results
 
@@ -177,4 +204,5 @@ def run_experiments():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     run_experiments()
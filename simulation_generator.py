@@ -3,68 +3,161 @@ Simulation Data Generator and Baseline Strategies
 Generates test data and implements baseline allocation strategies
 """
 
-import random
 import json
+import numpy as np
 from cloud_environment import Task, Resource, simulate
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the standard library encoder
+    orjson = None
 
-def generate_random_tasks(num_tasks, min_length=50, max_length=500):
+
+def write_json(path, data):
+    """Serialize data as indented JSON and write it to path in one call"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+
+def read_json(path):
+    """Read and parse the JSON file at path"""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def generate_random_task_arrays(num_tasks, min_length=50, max_length=500, seed=None):
+    """
+    Generate random task lengths as an array (task i has length lengths[i])
+    
+    Args:
+        seed: Seed for the numpy random generator (None for OS entropy)
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(min_length, max_length + 1, size=num_tasks, dtype=np.int32)
+
+
+def generate_random_resource_arrays(num_resources, min_speed=5, max_speed=30,
+                                    min_cost=3, max_cost=15, seed=None):
+    """
+    Generate random resource speeds and costs as arrays
+    
+    Args:
+        seed: Seed for the numpy random generator (None for OS entropy)
+    
+    Returns:
+        Tuple (speeds, costs); resource i has speeds[i] and costs[i]
+    """
+    rng = np.random.default_rng(seed)
+    speeds = rng.uniform(min_speed, max_speed, size=num_resources)
+    costs = rng.uniform(min_cost, max_cost, size=num_resources)
+    return speeds, costs
+
+
+def generate_random_tasks(num_tasks, min_length=50, max_length=500, seed=None):
     """Generate random tasks"""
-    tasks = []
-    for i in range(num_tasks):
-        length = random.randint(min_length, max_length)
-        tasks.append(Task(i, length))
-    return tasks
+    lengths = generate_random_task_arrays(num_tasks, min_length, max_length, seed)
+    return [Task(i, length) for i, length in enumerate(lengths.tolist())]
 
 
 def generate_random_resources(num_resources, min_speed=5, max_speed=30, 
-                              min_cost=3, max_cost=15):
+                              min_cost=3, max_cost=15, seed=None):
     """Generate random resources"""
-    resources = []
-    for i in range(num_resources):
-        speed = random.uniform(min_speed, max_speed)
-        cost = random.uniform(min_cost, max_cost)
-        resources.append(Resource(i, speed, cost))
-    return resources
+    speeds, costs = generate_random_resource_arrays(num_resources, min_speed, max_speed,
+                                                    min_cost, max_cost, seed)
+    return [Resource(i, speed, cost)
+            for i, (speed, cost) in enumerate(zip(speeds.tolist(), costs.tolist()))]
+
+
+# Columnar JSON layout: one list per field instead of one object per item.
+# Files without a "format" key are the older list-of-objects layout.
+JSON_FORMAT = "soa-v1"
+
+
+def tasks_to_json(tasks):
+    """Columnar JSON document for a list of tasks"""
+    return {
+        "format": JSON_FORMAT,
+        "ids": [t.id for t in tasks],
+        "lengths": [t.length for t in tasks]
+    }
+
+
+def resources_to_json(resources):
+    """Columnar JSON document for a list of resources"""
+    return {
+        "format": JSON_FORMAT,
+        "ids": [r.id for r in resources],
+        "speeds": [r.speed for r in resources],
+        "costs": [r.cost for r in resources]
+    }
+
+
+def tasks_from_json(data):
+    """Build tasks from a parsed JSON document (columnar or legacy layout)"""
+    if isinstance(data, dict):
+        return [Task(i, length) for i, length in zip(data["ids"], data["lengths"])]
+    return [Task(t['id'], t['length']) for t in data]
+
+
+def resources_from_json(data):
+    """Build resources from a parsed JSON document (columnar or legacy layout)"""
+    if isinstance(data, dict):
+        return [Resource(i, speed, cost)
+                for i, speed, cost in zip(data["ids"], data["speeds"], data["costs"])]
+    return [Resource(r['id'], r['speed'], r['cost']) for r in data]
 
 
 def save_to_json(tasks, resources, tasks_file='tasks.json', resources_file='resources.json'):
     """Save tasks and resources to JSON files"""
-    tasks_data = [{"id": t.id, "length": t.length} for t in tasks]
-    resources_data = [{"id": r.id, "speed": r.speed, "cost": r.cost} for r in resources]
-    
-    with open(tasks_file, 'w') as f:
-        json.dump(tasks_data, f, indent=2)
-    
-    with open(resources_file, 'w') as f:
-        json.dump(resources_data, f, indent=2)
+    write_json(tasks_file, tasks_to_json(tasks))
+    write_json(resources_file, resources_to_json(resources))
     
     print(f"Saved {len(tasks)} tasks to {tasks_file}")
     print(f"Saved {len(resources)} resources to {resources_file}")
 
 
-def random_assignment(tasks, resources):
+def random_assignment(tasks, resources, seed=None):
     """Random assignment strategy"""
-    return [random.randint(0, len(resources) - 1) for _ in range(len(tasks))]
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, len(resources), size=len(tasks), dtype=np.int32)
+
+
+def _resource_arrays(resources):
+    """Speeds and costs of the resources as arrays"""
+    speeds = np.fromiter((r.speed for r in resources), dtype=np.float64, count=len(resources))
+    costs = np.fromiter((r.cost for r in resources), dtype=np.float64, count=len(resources))
+    return speeds, costs
+
+
+def _uniform_assignment(tasks, resource_idx):
+    """Assignment putting every task on resource resource_idx"""
+    return np.full(len(tasks), resource_idx, dtype=np.int32)
 
 
 def fastest_assignment(tasks, resources):
     """Assign all tasks to the fastest resource"""
-    fastest_idx = max(range(len(resources)), key=lambda i: resources[i].speed)
-    return [fastest_idx for _ in range(len(tasks))]
+    speeds, _ = _resource_arrays(resources)
+    return _uniform_assignment(tasks, int(np.argmax(speeds)))
 
 
 def best_value_assignment(tasks, resources):
     """Assign all tasks to resource with best speed/cost ratio"""
-    best_idx = max(range(len(resources)), 
-                   key=lambda i: resources[i].speed / resources[i].cost)
-    return [best_idx for _ in range(len(tasks))]
+    # One pass over the resources, reading each speed and cost once
+    ratios = np.fromiter((r.speed / r.cost for r in resources), dtype=np.float64, count=len(resources))
+    return _uniform_assignment(tasks, int(np.argmax(ratios)))
 
 
 def cheapest_assignment(tasks, resources):
     """Assign all tasks to the cheapest resource"""
-    cheapest_idx = min(range(len(resources)), key=lambda i: resources[i].cost)
-    return [cheapest_idx for _ in range(len(tasks))]
+    _, costs = _resource_arrays(resources)
+    return _uniform_assignment(tasks, int(np.argmin(costs)))
 
 
 if __name__ == "__main__":
@@ -109,7 +202,7 @@ if __name__ == "__main__":
     for name, assignment in strategies.items():
         result = simulate(tasks, resources, assignment)
         print(f"\n{name}:")
-        print(f"  Assignment: {assignment}")
+        print(f"  Assignment: {assignment.tolist()}")
         print(f"  Total Time: {result['total_time']:.2f}")
         print(f"  Total Cost: {result['total_cost']:.2f}")
 
@@ -2,99 +2,279 @@
 Visualization module for Cloud Resource Allocation results
 """
 
-import matplotlib.pyplot as plt
-from typing import Dict
-from cultural_algorithm import CulturalAlgorithm
+import functools
+import html
+import json
+import logging
+import numpy as np
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
+if TYPE_CHECKING:
+    # Only needed for annotations; importing it would load Numba
+    from cultural_algorithm import CulturalAlgorithm
 
+logger = logging.getLogger(__name__)
+
+# Resolution of the saved PNG files
+SAVE_DPI = 150
+
+# Convergence histories up to this many generations are drawn on a smaller,
+# lower resolution figure: a few points don't need a full-size PNG
+SHORT_HISTORY = 50
+SHORT_HISTORY_DPI = 100
+
+# zlib level for the PNG files: fast DEFLATE at the price of larger files
+PNG_COMPRESS_LEVEL = 1
+
+# Figures kept across calls, keyed by (plot name, figsize, dpi). They are plain
+# Agg-backed Figures, never registered with pyplot, since they are only
+# saved to files. matplotlib itself is imported on first use, so importing
+# this module stays cheap for callers that never plot
+_FIG_CACHE = {}
+
+
+# Page written by write_plotly_report(); each entry of the figures list is
+# a Plotly figure spec ({'data': [...], 'layout': {...}}) drawn by plotly.js,
+# loaded from PLOTLY_JS_URL unless a local copy is inlined
+PLOTLY_JS_URL = 'https://cdn.plot.ly/plotly-2.35.2.min.js'
+_PLOTLY_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{script}
+</head>
+<body>
+<script>
+for (const spec of {figures}) {{
+    const div = document.createElement('div');
+    document.body.appendChild(div);
+    Plotly.newPlot(div, spec.data, spec.layout);
+}}
+</script>
+</body>
+</html>
+"""
+
+
+# Styling shared by every report plot, applied once per plot through
+# _styled() instead of repeating font sizes and grid alpha on each artist
+_STYLE = {
+    'font.size': 10,
+    'axes.titlesize': 14,
+    'axes.titleweight': 'bold',
+    'axes.labelsize': 12,
+    'grid.alpha': 0.3,
+}
+
+
+def _styled(plot):
+    """Decorator running a plot function (building and saving) under _STYLE"""
+    @functools.wraps(plot)
+    def wrapper(*args, **kwargs):
+        import matplotlib
+        
+        with matplotlib.rc_context(_STYLE):
+            return plot(*args, **kwargs)
+    return wrapper
+
+
+def _cached_figure(name: str, figsize: Tuple[float, float], dpi: float = SAVE_DPI):
+    """Return the cached figure for this plot, cleared, creating it on first use"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    key = (name, figsize, dpi)
+    fig = _FIG_CACHE.get(key)
+    if fig is None:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        _FIG_CACHE[key] = fig
+    else:
+        fig.clf()
+    return fig
+
+
+def _improvement(history: np.ndarray) -> np.ndarray:
+    """Percentage change of each history entry relative to the first one"""
+    return (history - history[0]) / history[0] * 100.0
+
+
+def _pareto_mask(points: np.ndarray) -> np.ndarray:
+    """
+    Mask of the non-dominated rows of points (both objectives minimized)
+    
+    A row is dominated when another row is no worse in every objective and
+    strictly better in at least one; all pairs are compared at once.
+    """
+    no_worse = (points[:, None, :] <= points[None, :, :]).all(axis=2)
+    better = (points[:, None, :] < points[None, :, :]).any(axis=2)
+    # dominates[i, j]: row i dominates row j
+    dominates = no_worse & better
+    return ~dominates.any(axis=0)
+
+
+def _save_png(fig, filename: str):
+    """
+    Render the figure and write its RGBA buffer straight to a PNG file
+    
+    Pillow (a matplotlib dependency) encodes the Agg buffer with a fast
+    compression level, instead of going through savefig's print_png path.
+    """
+    from PIL import Image
+    
+    fig.canvas.draw()
+    Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).save(
+        filename, compress_level=PNG_COMPRESS_LEVEL, dpi=(fig.dpi, fig.dpi))
+
+
+@_styled
 def plot_comparison(results: Dict):
     """
     Plot comparison of different allocation strategies
     Args:
         results: Dictionary mapping strategy names to results with 'time' and 'cost' keys
     """
-    strategies = list(results.keys())
-    times = [results[s]['time'] for s in strategies]
-    costs = [results[s]['cost'] for s in strategies]
+    from matplotlib.ticker import FixedFormatter, FixedLocator
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    items = list(results.items())
+    strategies = [name for name, _ in items]
+    # Bars sit at fixed integer positions with the strategy names as fixed
+    # tick labels, so no category conversion or tick search runs per draw
+    positions = np.arange(len(items))
+    times = np.fromiter((result['time'] for _, result in items), dtype=np.float64, count=len(items))
+    costs = np.fromiter((result['cost'] for _, result in items), dtype=np.float64, count=len(items))
+    
+    fig = _cached_figure('comparison', (14, 6))
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Time comparison
-    bars1 = ax1.bar(strategies, times, color='skyblue', edgecolor='navy', alpha=0.7)
-    ax1.set_xlabel('Strategy', fontsize=12)
-    ax1.set_ylabel('Total Time', fontsize=12)
-    ax1.set_title('Total Execution Time Comparison', fontsize=14, fontweight='bold')
+    bars1 = ax1.bar(positions, times, color='skyblue', edgecolor='navy', alpha=0.7,
+                   rasterized=True)
+    ax1.set_xlabel('Strategy')
+    ax1.set_ylabel('Total Time')
+    ax1.set_title('Total Execution Time Comparison')
+    ax1.xaxis.set_major_locator(FixedLocator(positions))
+    ax1.xaxis.set_major_formatter(FixedFormatter(strategies))
     ax1.tick_params(axis='x', rotation=45)
-    ax1.grid(axis='y', alpha=0.3)
+    ax1.grid(axis='y')
     
     # Add value labels on bars
-    for bar in bars1:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.2f}',
-                ha='center', va='bottom', fontsize=9)
+    ax1.bar_label(bars1, fmt='%.2f', padding=2, fontsize=9)
     
     # Cost comparison
-    bars2 = ax2.bar(strategies, costs, color='lightcoral', edgecolor='darkred', alpha=0.7)
-    ax2.set_xlabel('Strategy', fontsize=12)
-    ax2.set_ylabel('Total Cost', fontsize=12)
-    ax2.set_title('Total Cost Comparison', fontsize=14, fontweight='bold')
+    bars2 = ax2.bar(positions, costs, color='lightcoral', edgecolor='darkred', alpha=0.7,
+                   rasterized=True)
+    ax2.set_xlabel('Strategy')
+    ax2.set_ylabel('Total Cost')
+    ax2.set_title('Total Cost Comparison')
+    ax2.xaxis.set_major_locator(FixedLocator(positions))
+    ax2.xaxis.set_major_formatter(FixedFormatter(strategies))
     ax2.tick_params(axis='x', rotation=45)
-    ax2.grid(axis='y', alpha=0.3)
+    ax2.grid(axis='y')
     
     # Add value labels on bars
-    for bar in bars2:
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.2f}',
-                ha='center', va='bottom', fontsize=9)
+    ax2.bar_label(bars2, fmt='%.2f', padding=2, fontsize=9)
+    
+    # Fixed margins (room for the rotated strategy names) instead of a
+    # tight bounding box, which would cost an extra render pass
+    fig.subplots_adjust(left=0.08, right=0.98, top=0.92, bottom=0.32, wspace=0.25)
+    _save_png(fig, 'comparison_results.png')
+    logger.info("Saved: %s", "comparison_results.png")
+
+
+class ConvergencePlotter:
+    """
+    Convergence plot whose figure and artists are built once and reused
     
-    plt.tight_layout()
-    plt.savefig('comparison_results.png', dpi=300, bbox_inches='tight')
-    print("Saved: comparison_results.png")
-    plt.close()
+    Each update() only swaps the line data (Line2D.set_data) and the title,
+    then rescales and saves, so re-plotting many runs (e.g. a parameter
+    sweep) allocates no new artists.
+    """
+    
+    @_styled
+    def __init__(self, figsize: Tuple[float, float] = (10, 6), dpi: float = SAVE_DPI):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        
+        # One axis; the improvement over the first generation is a rescaled
+        # copy of the best fitness curve (on a twin axis it would sit right
+        # on top of it), so only its final value is shown, in the title
+        self.ax1 = self.fig.subplots()
+        
+        # Fitness convergence
+        self.line_best, = self.ax1.plot([], [], 'b-', linewidth=2, label='Best Fitness',
+                                        rasterized=True)
+        self.line_avg, = self.ax1.plot([], [], 'r--', linewidth=2, label='Average Fitness',
+                                       rasterized=True)
+        self.ax1.set_xlabel('Generation')
+        self.ax1.set_ylabel('Fitness')
+        self.ax1.grid()
+        
+        self.ax1.legend(loc='lower right')
+        
+        # Same absolute margins on any figure size (room for a two-line title)
+        width, height = figsize
+        self.fig.subplots_adjust(left=1.0 / width, right=1 - 0.3 / width, top=1 - 0.75 / height,
+                                 bottom=0.6 / height)
+    
+    @_styled
+    def update(self, algorithm: "CulturalAlgorithm", title: str = "Cultural Algorithm Convergence",
+               path: Optional[str] = None) -> Optional[str]:
+        """
+        Show the histories of algorithm and save the plot
+        Args:
+            algorithm: GeneticAlgorithm or CulturalAlgorithm object after running
+            title: Plot title
+            path: PNG file to write (default: derived from the title)
+        Returns:
+            Path of the saved file, or None when there is no history
+        """
+        if not algorithm.best_fitness_history:
+            logger.warning("No convergence data available")
+            return None
+        
+        best_fitness = np.asarray(algorithm.best_fitness_history, dtype=np.float64)
+        generations = np.arange(1, best_fitness.size + 1)
+        
+        self.line_best.set_data(generations, best_fitness)
+        self.line_avg.set_data(generations, np.asarray(algorithm.avg_fitness_history, dtype=np.float64))
+        
+        # Since we don't track time/cost per generation, we'll show fitness improvement
+        improvement = _improvement(best_fitness)[-1]
+        self.ax1.set_title(f'{title}\nBest fitness {improvement:+.1f}% over generation 1')
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        
+        if path is None:
+            path = title.lower().replace(' ', '_').replace('(', '').replace(')', '') + '.png'
+        _save_png(self.fig, path)
+        logger.info("Saved: %s", path)
+        return path
+
 
+# Convergence plotters kept across calls, keyed by (figsize, dpi)
+_CONVERGENCE_PLOTTERS = {}
 
-def plot_ga_convergence(algorithm: CulturalAlgorithm, title: str = "Cultural Algorithm Convergence"):
+
+def plot_ga_convergence(algorithm: "CulturalAlgorithm", title: str = "Cultural Algorithm Convergence"):
     """
     Plot algorithm convergence over generations (works for both GA and CA)
     Args:
         algorithm: GeneticAlgorithm or CulturalAlgorithm object after running
         title: Plot title
     """
-    if not algorithm.best_fitness_history:
-        print("No convergence data available")
-        return
-    
-    generations = range(1, len(algorithm.best_fitness_history) + 1)
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-    
-    # Fitness convergence
-    ax1.plot(generations, algorithm.best_fitness_history, 'b-', linewidth=2, label='Best Fitness')
-    ax1.plot(generations, algorithm.avg_fitness_history, 'r--', linewidth=2, label='Average Fitness')
-    ax1.set_xlabel('Generation', fontsize=12)
-    ax1.set_ylabel('Fitness', fontsize=12)
-    ax1.set_title(f'{title} - Fitness', fontsize=14, fontweight='bold')
-    ax1.legend()
-    ax1.grid(alpha=0.3)
-    
-    # Since we don't track time/cost per generation, we'll show fitness improvement
-    improvement = [(algorithm.best_fitness_history[i] - algorithm.best_fitness_history[0]) / algorithm.best_fitness_history[0] * 100
-                   for i in range(len(algorithm.best_fitness_history))]
-    
-    ax2.plot(generations, improvement, 'g-', linewidth=2)
-    ax2.set_xlabel('Generation', fontsize=12)
-    ax2.set_ylabel('Improvement (%)', fontsize=12)
-    ax2.set_title(f'{title} - Improvement Over Initial', fontsize=14, fontweight='bold')
-    ax2.grid(alpha=0.3)
-    ax2.axhline(y=0, color='k', linestyle='--', alpha=0.3)
-    
-    plt.tight_layout()
-    filename = title.lower().replace(' ', '_').replace('(', '').replace(')', '') + '.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"Saved: {filename}")
-    plt.close()
+    if len(algorithm.best_fitness_history) > SHORT_HISTORY:
+        key = ((10, 6), SAVE_DPI)
+    else:
+        key = ((8, 4), SHORT_HISTORY_DPI)
+    plotter = _CONVERGENCE_PLOTTERS.get(key)
+    if plotter is None:
+        plotter = _CONVERGENCE_PLOTTERS[key] = ConvergencePlotter(*key)
+    plotter.update(algorithm, title)
 
 
 def plot_results(results: Dict, save_path: str = 'results.png'):
@@ -108,39 +288,132 @@ def plot_results(results: Dict, save_path: str = 'results.png'):
     pass
 
 
+@_styled
 def plot_pareto_front(ga_results: Dict):
     """
     Plot Pareto front for multi-objective optimization (time vs cost)
     Args:
         ga_results: Dictionary of GA results with different objectives
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    import matplotlib.transforms as mtransforms
     
-    # Extract time and cost for each strategy
-    strategies = []
-    times = []
-    costs = []
+    fig = _cached_figure('pareto_front', (10, 6))
+    ax = fig.subplots()
     
-    for strategy, stats in ga_results.items():
-        strategies.append(strategy)
-        times.append(stats['best_time'])
-        costs.append(stats['best_cost'])
+    # Extract time and cost for each strategy in one pass
+    strategies = list(ga_results)
+    points = np.array([(stats['best_time'], stats['best_cost']) for stats in ga_results.values()],
+                      dtype=np.float64).reshape(-1, 2)
+    times, costs = points[:, 0], points[:, 1]
     
     # Scatter plot
-    scatter = ax.scatter(times, costs, s=100, alpha=0.6, c=range(len(strategies)), cmap='viridis')
+    ax.scatter(times, costs, s=100, alpha=0.6, c=np.arange(len(strategies)), cmap='viridis',
+               rasterized=True)
     
-    # Add labels
-    for i, strategy in enumerate(strategies):
-        ax.annotate(strategy, (times[i], costs[i]), 
-                   xytext=(5, 5), textcoords='offset points', fontsize=9)
+    # Connect the non-dominated points, in order of time
+    front = points[_pareto_mask(points)]
+    front = front[np.argsort(front[:, 0])]
+    ax.plot(front[:, 0], front[:, 1], 'k--', linewidth=1, alpha=0.5)
     
-    ax.set_xlabel('Total Time', fontsize=12)
-    ax.set_ylabel('Total Cost', fontsize=12)
-    ax.set_title('Pareto Front: Time vs Cost Trade-off', fontsize=14, fontweight='bold')
-    ax.grid(alpha=0.3)
+    # Add labels: plain text artists sharing one transform that offsets
+    # them 5 points up and right of their data point
+    label_transform = ax.transData + mtransforms.ScaledTranslation(5 / 72, 5 / 72, fig.dpi_scale_trans)
+    for strategy, time, cost in zip(strategies, times, costs):
+        ax.text(time, cost, strategy, transform=label_transform, fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig('pareto_front.png', dpi=300, bbox_inches='tight')
-    print("Saved: pareto_front.png")
-    plt.close()
+    ax.set_xlabel('Total Time')
+    ax.set_ylabel('Total Cost')
+    ax.set_title('Pareto Front: Time vs Cost Trade-off')
+    ax.grid()
+    
+    fig.subplots_adjust(left=0.1, right=0.92, top=0.92, bottom=0.1)
+    _save_png(fig, 'pareto_front.png')
+    logger.info("Saved: %s", "pareto_front.png")
+
 
+def write_plotly_report(results: Dict, algorithm: Optional["CulturalAlgorithm"] = None,
+                        ga_results: Optional[Dict] = None,
+                        title: str = "Cultural Algorithm Convergence",
+                        path: str = 'report.html', plotly_js: str = PLOTLY_JS_URL):
+    """
+    Write the report plots as Plotly figure specs in one HTML page
+    
+    Nothing is rendered here: the data is serialized and the browser draws
+    it with plotly.js. Needs no Python package beyond numpy.
+    Args:
+        results: Strategy results, as for plot_comparison()
+        algorithm: Algorithm object after running, as for plot_ga_convergence()
+        ga_results: Results per objective, as for plot_pareto_front()
+        title: Convergence plot title (and page title)
+        path: Path of the HTML file
+        plotly_js: URL the page loads plotly.js from (http://, https:// or
+                   //), or else the path of a local plotly.js file, which
+                   is inlined so the page also renders offline
+    """
+    strategies = list(results)
+    figures = [{
+        'data': [
+            {'type': 'bar', 'x': strategies, 'y': [float(results[s]['time']) for s in strategies],
+             'name': 'Total Time', 'marker': {'color': 'skyblue'}},
+            {'type': 'bar', 'x': strategies, 'y': [float(results[s]['cost']) for s in strategies],
+             'name': 'Total Cost', 'marker': {'color': 'lightcoral'},
+             'xaxis': 'x2', 'yaxis': 'y2'},
+        ],
+        'layout': {
+            'title': {'text': 'Total Execution Time and Cost Comparison'},
+            'grid': {'rows': 1, 'columns': 2, 'pattern': 'independent'},
+            'yaxis': {'title': {'text': 'Total Time'}},
+            'yaxis2': {'title': {'text': 'Total Cost'}},
+            'width': 1400, 'height': 600,
+        },
+    }]
+    
+    if algorithm is not None and algorithm.best_fitness_history:
+        best_fitness = np.asarray(algorithm.best_fitness_history, dtype=np.float64)
+        generations = np.arange(1, best_fitness.size + 1).tolist()
+        improvement = _improvement(best_fitness)[-1]
+        figures.append({
+            'data': [
+                {'type': 'scatter', 'mode': 'lines', 'x': generations, 'y': best_fitness.tolist(),
+                 'name': 'Best Fitness', 'line': {'color': 'blue'}},
+                {'type': 'scatter', 'mode': 'lines', 'x': generations,
+                 'y': np.asarray(algorithm.avg_fitness_history, dtype=np.float64).tolist(),
+                 'name': 'Average Fitness', 'line': {'color': 'red', 'dash': 'dash'}},
+            ],
+            'layout': {
+                'title': {'text': f'{title}<br>Best fitness {improvement:+.1f}% over generation 1'},
+                'xaxis': {'title': {'text': 'Generation'}},
+                'yaxis': {'title': {'text': 'Fitness'}},
+                'width': 1000, 'height': 600,
+            },
+        })
+    
+    if ga_results:
+        names = list(ga_results)
+        figures.append({
+            'data': [{
+                'type': 'scatter', 'mode': 'markers+text', 'text': names,
+                'textposition': 'top right',
+                'x': [float(ga_results[n]['best_time']) for n in names],
+                'y': [float(ga_results[n]['best_cost']) for n in names],
+                'marker': {'size': 12, 'color': list(range(len(names))), 'colorscale': 'Viridis'},
+            }],
+            'layout': {
+                'title': {'text': 'Pareto Front: Time vs Cost Trade-off'},
+                'xaxis': {'title': {'text': 'Total Time'}},
+                'yaxis': {'title': {'text': 'Total Cost'}},
+                'width': 1000, 'height': 600,
+            },
+        })
+    
+    # '</' is escaped so data strings cannot close the script element
+    payload = json.dumps(figures).replace('</', '<\\/')
+    if plotly_js.startswith(('http://', 'https://', '//')):
+        script = f'<script src="{html.escape(plotly_js)}"></script>'
+    else:
+        # A missing file raises here rather than silently becoming a URL
+        with open(plotly_js, encoding='utf-8') as f:
+            script = '<script>' + f.read().replace('</script', '<\\/script') + '</script>'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(_PLOTLY_PAGE.format(title=html.escape(title), script=script, figures=payload))
+    logger.info("Saved: %s", path)